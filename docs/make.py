@@ -4,14 +4,24 @@ Build API documentation using pdoc, then enhance navigation/branding.
 This script delegates API generation to run_pdoc.py (so django.setup() runs),
 then ensures Markdown guides are present and styled consistently. Finally, it
 adds a simple top bar and validates the output for CI.
+
+Builds are incremental: source content hashes and the extracted pdoc shell
+are cached in docs/.build-cache.json, so pdoc only runs when Python sources
+change and only changed guides are re-rendered, in separate processes. Pass
+--force to rebuild everything.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
 from pathlib import Path
 
 try:
@@ -22,6 +32,44 @@ except Exception:  # pragma: no cover
 
 ROOT = Path(__file__).resolve().parents[1]
 BUILD_DIR = ROOT / "docs" / "api"
+# Kept outside BUILD_DIR so it is not published with the site.
+CACHE_FILE = ROOT / "docs" / ".build-cache.json"
+
+
+def hash_files(paths: list[Path]) -> str:
+    h = hashlib.sha256()
+    for p in sorted(paths):
+        h.update(p.relative_to(ROOT).as_posix().encode("utf-8") + b"\0")
+        h.update(p.read_bytes() if p.exists() else b"")
+    return h.hexdigest()
+
+
+def api_fingerprint() -> str:
+    """Hash of everything that affects pdoc output."""
+    sources = [
+        *(ROOT / "reports_ai").rglob("*.py"),
+        ROOT / "run_pdoc.py",
+        ROOT / "docs" / "settings.py",
+        # Inherited members of third-party classes are rendered too.
+        ROOT / "pyproject.toml",
+        ROOT / "uv.lock",
+    ]
+    try:
+        pdoc_version = metadata.version("pdoc")
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        pdoc_version = ""
+    return hash_files(sources) + pdoc_version
+
+
+def load_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict) -> None:
+    CACHE_FILE.write_text(json.dumps(cache, indent=2), encoding="utf-8")
 
 
 def run_pdoc_api() -> None:
@@ -171,8 +219,8 @@ def inject_branding() -> (  # noqa: C901 - keep logic centralized; template over
 
     api_tree = build_api_tree()
 
-    for html_path in BUILD_DIR.rglob("*.html"):
-        text = html_path.read_text(encoding="utf-8")
+    def brand(html_path: Path) -> None:
+        original = text = html_path.read_text(encoding="utf-8")
 
         if "<!-- custom-head start -->" not in text:
             text = re.sub(r"</head>", head_inject + "\n</head>", text, count=1)
@@ -213,8 +261,20 @@ def inject_branding() -> (  # noqa: C901 - keep logic centralized; template over
 
         if "<!-- custom-footer start -->" not in text:
             text = re.sub(r"(</body>)", footer_html + r"\n\1", text, count=1)
+        else:
+            # Pages persist across incremental builds; keep the year current.
+            text = re.sub(
+                r"<!-- custom-footer start -->[\s\S]*?<!-- custom-footer end -->",
+                lambda _: footer_html.strip(),
+                text,
+                count=1,
+            )
 
-        html_path.write_text(text, encoding="utf-8")
+        if text != original:
+            html_path.write_text(text, encoding="utf-8")
+
+    for html_path in BUILD_DIR.rglob("*.html"):
+        brand(html_path)
 
 
 def validate_site() -> None:
@@ -261,46 +321,72 @@ def validate_site() -> None:
 
 
 def main() -> None:
-    run_pdoc_api()
-
+    force = "--force" in sys.argv[1:]
     BUILD_DIR.mkdir(parents=True, exist_ok=True)
-    head, nav, tail = extract_pdoc_shell(BUILD_DIR / "reports_ai.html")
-
-    # Always re-generate homepage from README to make it the landing page.
-    render_markdown(
-        ROOT / "README.md",
-        BUILD_DIR / "index.html",
-        "Reports AI",
-        head,
-        nav,
-        tail,
-        True,
-    )
-
-    # Ensure Guides and Configuration exist (generate if missing).
-    render_markdown(
-        ROOT / "docs" / "usage.md",
-        BUILD_DIR / "usage.html",
-        "Usage",
-        head,
-        nav,
-        tail,
-        False,
-    )
-    render_markdown(
-        ROOT / "docs" / "configuration.md",
-        BUILD_DIR / "configuration.html",
-        "Configuration",
-        head,
-        nav,
-        tail,
-        False,
+    cache = {} if force else load_cache()
+
+    api_hash = api_fingerprint()
+    if (
+        cache.get("api") != api_hash
+        or "shell" not in cache
+        or not (BUILD_DIR / "reports_ai.html").exists()
+    ):
+        # pdoc never clears its output; drop pages of removed modules.
+        shutil.rmtree(BUILD_DIR / "reports_ai", ignore_errors=True)
+        (BUILD_DIR / "reports_ai.html").unlink(missing_ok=True)
+        run_pdoc_api()
+        # Extract before branding so cached pages share pdoc's own shell.
+        cache["api"] = api_hash
+        cache["shell"] = list(extract_pdoc_shell(BUILD_DIR / "reports_ai.html"))
+        cache["pages"] = {}
+    else:
+        print("Python sources unchanged; skipping pdoc.")
+    head, nav, tail = cache["shell"]
+
+    # README is the landing page; the guides sit alongside it.
+    pages = [
+        (ROOT / "README.md", BUILD_DIR / "index.html", "Reports AI"),
+        (ROOT / "docs" / "usage.md", BUILD_DIR / "usage.html", "Usage"),
+        (
+            ROOT / "docs" / "configuration.md",
+            BUILD_DIR / "configuration.html",
+            "Configuration",
+        ),
+    ]
+    # Pages embed the pdoc shell and branding, so those are part of each key.
+    shared = hash_files(
+        [
+            Path(__file__).resolve(),
+            *(p for p in (ROOT / "docs" / "vendor").rglob("*") if p.is_file()),
+        ]
     )
+    page_cache = cache.setdefault("pages", {})
+    stale = []
+    for src, dst, title in pages:
+        key = hashlib.sha256(
+            (api_hash + shared + hash_files([src])).encode("utf-8")
+        ).hexdigest()
+        if page_cache.get(dst.name) != key or not dst.exists():
+            stale.append((src, dst, title))
+            page_cache[dst.name] = key
+
+    if stale:
+        print(f"Rendering {len(stale)} guide page(s) ...")
+        with ProcessPoolExecutor() as pool:
+            futures = [
+                pool.submit(render_markdown, *page, head, nav, tail, True)
+                for page in stale
+            ]
+            for future in futures:
+                future.result()
+    else:
+        print("Guide pages unchanged; skipping Markdown rendering.")
 
     print("Enhancing generated pages with nav/footer ...")
     inject_branding()
     print("Enhancements applied.")
     validate_site()
+    save_cache(cache)
 
 
 if __name__ == "__main__":
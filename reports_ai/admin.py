@@ -6,6 +6,7 @@ from .views import (
     ReportInstanceCreateView,
     ReportInstanceDetailView,
     ReportInstanceListView,
+    retry_report_section,
     trigger_report_generation,
 )
 
@@ -42,5 +43,10 @@ class ReportInstanceAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(trigger_report_generation),
                 name="generate_report",
             ),
+            path(
+                "reports/<int:pk>/sections/<str:section>/retry/",
+                self.admin_site.admin_view(retry_report_section),
+                name="retry_report_section",
+            ),
         ]
         return my_urls + urls
@@ -1,29 +1,30 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
 
-from django_ai_assistant import AIAssistant, method_tool
-
-from .services.git_service import GitService
+from django_ai_assistant import AIAssistant
 
 
 class ReportAssistant(AIAssistant):
     """AI assistant specialized in summarizing Git commit history.
 
-    Exposes a `get_commits` tool that fetches commit messages from the
-    repository path passed during initialization.
+    Commit data is supplied in the prompt by `LLMService`, already bounded
+    to the report's range and token budget, so the assistant has no tools.
     """
 
     id = "report_assistant"
     name = "Report Assistant"
     instructions = (
         "You summarize recent Git commits into concise progress notes. "
-        "When needed, call the get_commits tool to retrieve commit messages."
+        "Base the summary only on the commits provided in the message."
     )
     model = os.getenv("REPORTS_AI_LLM_MODEL", "gpt-4o")
     temperature: float | None = 0.3
 
+    def get_model(self) -> str:
+        # A per-run model (e.g. picked by ModelRouter) overrides the default.
+        return self._init_kwargs.get("model") or super().get_model()
+
     # Provider-aware LLM selection. Defaults to OpenAI via langchain_openai.
     def get_llm(self):  # type: ignore[override]
         provider = (
@@ -68,18 +69,3 @@ class ReportAssistant(AIAssistant):
             raise ValueError(
                 f"Unsupported REPORTS_AI_LLM_PROVIDER: {provider!r}. Supported: openai, anthropic, google."
             )
-
-    @method_tool
-    def get_commits(self, since: Optional[str] = None) -> list[str]:
-        """Return commit messages since a given commit hash (or all commits).
-
-        Args:
-            since: Optional commit hash to filter the log.
-
-        Returns:
-            A list of commit message strings.
-        """
-        repo_path = self._init_kwargs.get("repo_path")
-        service = GitService(repo_path=repo_path)
-        commits = service.get_commits_since(since)
-        return [c.message for c in commits]
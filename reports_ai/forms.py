@@ -6,4 +6,10 @@ from .models import ReportInstance
 class ReportInstanceForm(forms.ModelForm):
     class Meta:
         model = ReportInstance
-        fields = ["title", "report_type", "git_repo_url"]
+        fields = [
+            "title",
+            "report_type",
+            "git_repo_url",
+            "history_window_days",
+            "max_commits",
+        ]
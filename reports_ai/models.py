@@ -1,5 +1,8 @@
 # reports_ai/models.py
+from datetime import datetime, timedelta
+
 from django.db import models
+from django.utils import timezone
 
 
 class ReportInstance(models.Model):
@@ -13,7 +16,12 @@ class ReportInstance(models.Model):
     report_type = models.CharField(max_length=50, default="investor_update")
     git_repo_url = models.URLField(max_length=255)
     last_commit_hash = models.CharField(max_length=40, blank=True, null=True)
+    # Bounds for the first ingestion, before last_commit_hash is known.
+    history_window_days = models.PositiveIntegerField(blank=True, null=True)
+    max_commits = models.PositiveIntegerField(blank=True, null=True)
     generated_report = models.TextField(blank=True, null=True)
+    # Per-section results: {"base": ..., "head": ..., "sections": {...}}
+    generated_sections = models.JSONField(default=dict, blank=True)
     report_status = models.CharField(
         max_length=20, choices=REPORT_STATUS_CHOICES, default="pending"
     )
@@ -25,3 +33,14 @@ class ReportInstance(models.Model):
 
     def __str__(self):
         return f"{self.title} ({self.get_report_status_display()})"
+
+    @property
+    def failed_sections(self) -> list[str]:
+        sections = (self.generated_sections or {}).get("sections", {})
+        return [key for key, result in sections.items() if result.get("error")]
+
+    def history_since(self) -> datetime | None:
+        """Start of the first-ingestion window, if one is configured."""
+        if self.history_window_days:
+            return timezone.now() - timedelta(days=self.history_window_days)
+        return None
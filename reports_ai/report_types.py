@@ -0,0 +1,100 @@
+"""Section templates for each `ReportInstance.report_type`.
+
+A template is an ordered list of sections. Each section is generated from
+the same commit data independently, so sections can run concurrently and
+be retried on their own. Projects can add or override templates with the
+`REPORTS_AI_REPORT_TEMPLATES` setting, a mapping of report type to a list
+of `ReportSection` objects.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class ReportSection:
+    """One section of a report."""
+
+    key: str
+    title: str
+    instructions: str
+
+
+DEFAULT_SECTIONS = [
+    ReportSection(
+        key="summary",
+        title="Summary",
+        instructions="Summarize the overall progress made in these commits.",
+    ),
+]
+
+REPORT_TEMPLATES: dict[str, list[ReportSection]] = {
+    "investor_update": [
+        ReportSection(
+            key="highlights",
+            title="Highlights",
+            instructions=(
+                "List the three to five most significant outcomes, written "
+                "for a non-technical investor audience."
+            ),
+        ),
+        ReportSection(
+            key="shipped_features",
+            title="Shipped Features",
+            instructions=(
+                "Describe user-facing features and improvements that were "
+                "completed. Group related commits into a single item."
+            ),
+        ),
+        ReportSection(
+            key="risks",
+            title="Risks",
+            instructions=(
+                "Identify risks suggested by the commits, such as reverts, "
+                "repeated fixes, security patches or large refactors."
+            ),
+        ),
+        ReportSection(
+            key="contributor_activity",
+            title="Contributor Activity",
+            instructions=(
+                "Summarize who contributed and the areas each person "
+                "focused on."
+            ),
+        ),
+    ],
+}
+
+
+def get_report_sections(report_type: str | None) -> list[ReportSection]:
+    """Returns the ordered sections for a report type."""
+    templates = {
+        **REPORT_TEMPLATES,
+        **getattr(settings, "REPORTS_AI_REPORT_TEMPLATES", {}),
+    }
+    return templates.get(report_type or "", DEFAULT_SECTIONS)
+
+
+def assemble_report(report_type: str | None, sections: dict[str, dict]) -> str:
+    """Joins generated sections in template order.
+
+    Args:
+        report_type: The report type whose template sets the order.
+        sections: Mapping of section key to a dict with `title`,
+            `content` and `error` entries.
+
+    Returns:
+        The report as Markdown. Failed or missing sections are noted.
+    """
+    parts = []
+    for section in get_report_sections(report_type):
+        result = sections.get(section.key) or {}
+        if result.get("error") or not result.get("content"):
+            body = "_This section failed to generate._"
+        else:
+            body = result["content"].strip()
+        parts.append(f"## {section.title}\n\n{body}")
+    return "\n\n".join(parts)
@@ -0,0 +1,236 @@
+"""Local, dependency-free clustering of commits by theme.
+
+Commits are vectorized with TF-IDF over their message words and touched
+path prefixes, then grouped with spherical k-means. Everything runs in
+process, so no network access or extra packages are required.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+import git
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9_]+")
+_STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from",
+        "in", "into", "is", "it", "of", "on", "or", "that", "the", "this",
+        "to", "was", "were", "with", "merge", "branch", "pull", "request",
+    }
+)  # fmt: skip
+
+
+@dataclass
+class CommitCluster:
+    """A group of commits that share a theme."""
+
+    label: str
+    commits: list[git.Commit]
+    samples: list[git.Commit]
+    paths: list[str] = field(default_factory=list)
+
+
+class CommitClusterer:
+    """Groups commits into themed clusters using TF-IDF and k-means."""
+
+    def __init__(
+        self,
+        max_clusters: int = 12,
+        samples_per_cluster: int = 3,
+        max_iterations: int = 20,
+        seed: int = 0,
+        sample_size: int = 2000,
+    ):
+        """Initializes the CommitClusterer.
+
+        Args:
+            max_clusters: Upper bound on the number of clusters produced.
+            samples_per_cluster: Representative commits kept per cluster.
+            max_iterations: Maximum k-means refinement passes.
+            seed: Seed for centroid initialization, for stable output.
+            sample_size: Centroids are fitted on at most this many commits;
+                the rest are then assigned to the nearest centroid, which
+                keeps very large ranges fast.
+        """
+        self.max_clusters = max_clusters
+        self.samples_per_cluster = samples_per_cluster
+        self.max_iterations = max_iterations
+        self.seed = seed
+        self.sample_size = sample_size
+
+    def cluster(
+        self,
+        commits: list[git.Commit],
+        files: dict[str, list[str]] | None = None,
+    ) -> list[CommitCluster]:
+        """Clusters commits, largest cluster first.
+
+        Args:
+            commits: The commits to cluster.
+            files: Files touched per commit SHA, e.g. from
+                `GitService.get_touched_files`. Without it, commits are
+                clustered on their messages only.
+        """
+        if not commits:
+            return []
+        files = files or {}
+        paths = [self._dirs(files.get(c.hexsha, [])) for c in commits]
+        vectors = self._vectorize(
+            [
+                self._tokens(c.message, p)
+                for c, p in zip(commits, paths, strict=True)
+            ]
+        )
+        k = min(self.max_clusters, max(1, round(math.sqrt(len(commits) / 2))))
+        sample = vectors
+        if len(vectors) > self.sample_size:
+            sample = random.Random(self.seed).sample(vectors, self.sample_size)
+        centroids, _ = self._kmeans(sample, k)
+        assignments = [self._nearest(v, centroids) for v in vectors]
+        background = self._mean(vectors)
+
+        clusters = []
+        for idx, centroid in enumerate(centroids):
+            members = [i for i, a in enumerate(assignments) if a == idx]
+            if not members:
+                continue
+            members.sort(key=lambda i: -self._dot(vectors[i], centroid))
+            path_counts = Counter(p for i in members for p in paths[i])
+            clusters.append(
+                CommitCluster(
+                    label=self._label(centroid, background),
+                    commits=[commits[i] for i in members],
+                    samples=[
+                        commits[i] for i in members[: self.samples_per_cluster]
+                    ],
+                    paths=[p for p, _ in path_counts.most_common(3)],
+                )
+            )
+        clusters.sort(key=lambda c: -len(c.commits))
+        return clusters
+
+    def format_clusters(self, clusters: list[CommitCluster]) -> str:
+        """Renders clusters as a compact, labelled digest for a prompt."""
+        sections = []
+        for cluster in clusters:
+            header = f"## {cluster.label} ({len(cluster.commits)} commits)"
+            if cluster.paths:
+                header += f"\nPaths: {', '.join(cluster.paths)}"
+            lines = [
+                f"- {c.hexsha[:7]} ({c.author.name}) "
+                f"{c.message.strip().splitlines()[0]}"
+                for c in cluster.samples
+                if c.message.strip()
+            ]
+            sections.append("\n".join([header, *lines]))
+        return "\n\n".join(sections)
+
+    @staticmethod
+    def _dirs(files: list[str]) -> list[str]:
+        """Returns the parent directories of the given files."""
+        return sorted({f.rsplit("/", 1)[0] if "/" in f else "." for f in files})
+
+    @staticmethod
+    def _tokens(message: str, paths: list[str]) -> list[str]:
+        words = [
+            w for w in _WORD_RE.findall(message.lower()) if w not in _STOPWORDS
+        ]
+        return words + [f"path:{p}" for p in paths]
+
+    @staticmethod
+    def _vectorize(documents: list[list[str]]) -> list[dict[str, float]]:
+        """Builds L2-normalized sparse TF-IDF vectors."""
+        doc_freq = Counter(t for doc in documents for t in set(doc))
+        total = len(documents)
+        vectors = []
+        for doc in documents:
+            counts = Counter(doc)
+            vec = {
+                t: (1 + math.log(n))
+                * (math.log((1 + total) / (1 + doc_freq[t])) + 1)
+                for t, n in counts.items()
+            }
+            norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+            vectors.append({t: v / norm for t, v in vec.items()})
+        return vectors
+
+    @staticmethod
+    def _dot(a: dict[str, float], b: dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(v * b.get(t, 0.0) for t, v in a.items())
+
+    def _kmeans(
+        self, vectors: list[dict[str, float]], k: int
+    ) -> tuple[list[dict[str, float]], list[int]]:
+        """Spherical k-means with k-means++ seeding."""
+        rng = random.Random(self.seed)
+        centroids = [vectors[rng.randrange(len(vectors))]]
+        while len(centroids) < k:
+            dists = [
+                1.0 - max(self._dot(v, c) for c in centroids) for v in vectors
+            ]
+            if sum(dists) <= 0:
+                break
+            centroids.append(rng.choices(vectors, weights=dists)[0])
+
+        assignments: list[int] = []
+        for _ in range(self.max_iterations):
+            new_assignments = [self._nearest(v, centroids) for v in vectors]
+            if new_assignments == assignments:
+                break
+            assignments = new_assignments
+            centroids = [
+                self._mean(
+                    [
+                        v
+                        for v, a in zip(vectors, assignments, strict=True)
+                        if a == idx
+                    ]
+                )
+                or centroids[idx]
+                for idx in range(len(centroids))
+            ]
+        return centroids, assignments
+
+    @classmethod
+    def _nearest(
+        cls, vector: dict[str, float], centroids: list[dict[str, float]]
+    ) -> int:
+        scores = [cls._dot(vector, c) for c in centroids]
+        return scores.index(max(scores))
+
+    @staticmethod
+    def _mean(vectors: list[dict[str, float]]) -> dict[str, float]:
+        total: Counter = Counter()
+        for vec in vectors:
+            total.update(vec)
+        norm = math.sqrt(sum(v * v for v in total.values()))
+        return {t: v / norm for t, v in total.items()} if norm else {}
+
+    @staticmethod
+    def _label(
+        centroid: dict[str, float],
+        background: dict[str, float],
+        terms: int = 4,
+    ) -> str:
+        """Names a cluster by the terms that most set it apart.
+
+        Terms are ranked by centroid weight above their weight in the
+        centroid of all commits, so words shared by every commit do not
+        dominate.
+        """
+        ranked = sorted(
+            centroid, key=lambda t: background.get(t, 0.0) - centroid[t]
+        )
+        names = [
+            f"{t[len('path:'):]}/" if t.startswith("path:") else t
+            for t in ranked[:terms]
+            if centroid[t] > background.get(t, 0.0)
+        ]
+        return ", ".join(names) or "misc"
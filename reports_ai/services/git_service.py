@@ -1,4 +1,6 @@
 import os
+import shutil
+from datetime import datetime
 from urllib.parse import urlparse
 
 import git
@@ -8,17 +10,36 @@ from django.conf import settings
 class GitService:
     """A service for interacting with Git repositories."""
 
-    def __init__(self, repo_url: str, token: str = None):
+    def __init__(
+        self,
+        repo_url: str | None = None,
+        token: str = None,
+        repo_path: str | None = None,
+        shallow_since: datetime | None = None,
+        depth: int | None = None,
+    ):
         """Initializes the GitService.
 
         Args:
             repo_url: The URL of the Git repository.
             token: The GitHub token for private repositories.
+            repo_path: Path to an existing local clone. When given, the
+                repository is opened as-is without cloning or pulling.
+            shallow_since: Only fetch history after this time on first
+                clone (`git clone --shallow-since`).
+            depth: Only fetch this many commits on first clone
+                (`git clone --depth`). Ignored if `shallow_since` is set.
         """
         self.repo_url = repo_url
         self.token = token
-        self.clone_path = self._get_clone_path()
-        self.repo = self._get_or_clone_repo()
+        self.shallow_since = shallow_since
+        self.depth = depth
+        if repo_path:
+            self.clone_path = repo_path
+            self.repo = git.Repo(repo_path)
+        else:
+            self.clone_path = self._get_clone_path()
+            self.repo = self._get_or_clone_repo()
 
     def _get_clone_path(self) -> str:
         """Gets the local path to clone the repository to."""
@@ -43,16 +64,156 @@ class GitService:
                 )
             else:
                 clone_url = self.repo_url
-            return git.Repo.clone_from(clone_url, self.clone_path)
+            shallow = {}
+            if self.shallow_since:
+                shallow["shallow_since"] = self.shallow_since.isoformat()
+            elif self.depth:
+                shallow["depth"] = self.depth
+            try:
+                return git.Repo.clone_from(
+                    clone_url, self.clone_path, **shallow
+                )
+            except git.GitCommandError:
+                if "shallow_since" not in shallow:
+                    raise
+                # No commits in the window (a dormant repository); clone
+                # the tip only and let the bounded walk return nothing.
+                shutil.rmtree(self.clone_path, ignore_errors=True)
+                return git.Repo.clone_from(clone_url, self.clone_path, depth=1)
+
+    def is_shallow(self) -> bool:
+        """Returns whether the local clone has truncated history."""
+        return os.path.exists(os.path.join(self.repo.git_dir, "shallow"))
+
+    def _has_commit(self, commit_hash: str) -> bool:
+        try:
+            self.repo.git.cat_file("-e", f"{commit_hash}^{{commit}}")
+        except git.GitCommandError:
+            return False
+        return True
+
+    def ensure_commit(self, commit_hash: str, deepen_by: int = 100) -> None:
+        """Deepens a shallow clone until it contains `commit_hash`.
+
+        Fetches progressively more history, then falls back to fetching
+        the full history.
+        """
+        if not self.is_shallow() or self._has_commit(commit_hash):
+            return
+        for _ in range(4):
+            self.repo.git.fetch("origin", f"--deepen={deepen_by}")
+            if self._has_commit(commit_hash) or not self.is_shallow():
+                return
+            deepen_by *= 4
+        self.repo.git.fetch("origin", "--unshallow")
+
+    def _shallow_boundary(self) -> list[git.Commit]:
+        path = os.path.join(self.repo.git_dir, "shallow")
+        with open(path, encoding="utf-8") as f:
+            return [self.repo.commit(sha) for sha in f.read().split()]
+
+    def ensure_history(
+        self,
+        until: str = "HEAD",
+        since: datetime | None = None,
+        max_count: int | None = None,
+    ) -> None:
+        """Deepens a shallow clone to cover a bounded history walk.
+
+        The clone is shared by every report on the same repository, so it
+        may have been cloned with tighter bounds than this walk needs.
+        Without bounds, the full history is fetched.
+        """
+        if not self.is_shallow():
+            return
+        if since:
+            # Deepen until every line of history reaches back past `since`.
+            # --deepen only adds history, whereas --shallow-since can also
+            # cut it back and drop commits other reports on this clone use.
+            deepen_by = 50
+            for _ in range(6):
+                if not self.is_shallow() or all(
+                    c.committed_date < since.timestamp()
+                    for c in self._shallow_boundary()
+                ):
+                    return
+                self.repo.git.fetch("origin", f"--deepen={deepen_by}")
+                deepen_by *= 4
+            if self.is_shallow():
+                self.repo.git.fetch("origin", "--unshallow")
+            return
+        if not max_count:
+            self.repo.git.fetch("origin", "--unshallow")
+            return
+        for _ in range(4):
+            missing = max_count - int(self.repo.git.rev_list("--count", until))
+            if missing <= 0 or not self.is_shallow():
+                return
+            self.repo.git.fetch("origin", f"--deepen={missing}")
+        self.repo.git.fetch("origin", "--unshallow")
 
     def get_current_head(self) -> str:
         """Gets the current HEAD commit hash."""
         return self.repo.head.commit.hexsha
 
     def get_commits_since(
-        self, last_commit_hash: str | None
+        self,
+        last_commit_hash: str | None,
+        until: str | None = None,
+        since: datetime | None = None,
+        max_count: int | None = None,
     ) -> list[git.Commit]:
-        """Gets all commits since a given commit hash."""
+        """Gets all commits since a given commit hash.
+
+        Args:
+            last_commit_hash: Exclusive start of the range, or `None` for
+                the full history.
+            until: Inclusive end of the range. Defaults to HEAD.
+            since: Without `last_commit_hash`, only include commits after
+                this time.
+            max_count: Without `last_commit_hash`, only include this many
+                of the most recent commits.
+        """
+        until = until or "HEAD"
+        if last_commit_hash:
+            self.ensure_commit(last_commit_hash)
+            return list(self.repo.iter_commits(f"{last_commit_hash}..{until}"))
+        self.ensure_history(until, since, max_count)
+        bounds = {}
+        if since:
+            bounds["since"] = since.isoformat()
+        if max_count:
+            bounds["max_count"] = max_count
+        return list(self.repo.iter_commits(until, **bounds))
+
+    def get_touched_files(
+        self,
+        last_commit_hash: str | None,
+        until: str | None = None,
+        since: datetime | None = None,
+        max_count: int | None = None,
+    ) -> dict[str, list[str]]:
+        """Maps each commit in a range to the files it touched.
+
+        Takes the same range arguments as `get_commits_since`, but reads
+        the whole range with a single `git log --name-only` call.
+        """
+        until = until or "HEAD"
+        args = ["--name-only", "--format=%x00%H"]
         if last_commit_hash:
-            return list(self.repo.iter_commits(f"{last_commit_hash}..HEAD"))
-        return list(self.repo.iter_commits())
+            args.append(f"{last_commit_hash}..{until}")
+        else:
+            if since:
+                args.append(f"--since={since.isoformat()}")
+            if max_count:
+                args.append(f"--max-count={max_count}")
+            args.append(until)
+
+        files: dict[str, list[str]] = {}
+        current: list[str] = []
+        for line in self.repo.git.log(*args).splitlines():
+            if line.startswith("\0"):
+                current = files.setdefault(line[1:], [])
+            elif line:
+                current.append(line)
+        return files
@@ -1,41 +1,216 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+
 from reports_ai.ai_assistants import ReportAssistant
+from reports_ai.report_types import (
+    DEFAULT_SECTIONS,
+    ReportSection,
+    get_report_sections,
+)
 
+from .commit_clustering import CommitClusterer
 from .git_service import GitService
+from .model_routing import ModelRouter, estimate_tokens
 
 
 class LLMService:
     """A service for interacting with a Large Language Model using django-ai-assistant."""
 
-    def __init__(self, repo_path: str):
+    def __init__(
+        self,
+        repo_path: str,
+        cluster_commits: bool | None = None,
+        report_type: str | None = None,
+        router: ModelRouter | None = None,
+        history_since: datetime | None = None,
+        max_commits: int | None = None,
+    ):
         """Initializes the LLMService.
 
         Args:
             repo_path: The path to the Git repository.
+            cluster_commits: Group commits into themed clusters locally
+                before prompting. Defaults to the
+                `REPORTS_AI_CLUSTER_COMMITS` setting.
+            report_type: The report type, used to pick routing rules.
+            router: Model router. Defaults to one built from settings.
+            history_since: Without a starting commit hash, only include
+                commits after this time.
+            max_commits: Without a starting commit hash, only include this
+                many of the most recent commits.
         """
         self.repo_path = repo_path
-        # Initialize our concrete assistant with repo context.
-        self.assistant = ReportAssistant(repo_path=repo_path)
+        if cluster_commits is None:
+            cluster_commits = getattr(
+                settings, "REPORTS_AI_CLUSTER_COMMITS", False
+            )
+        self.cluster_commits = cluster_commits
+        self.report_type = report_type
+        self.router = router or ModelRouter()
+        self.history_since = history_since
+        self.max_commits = max_commits
+
+    def _get_commit_objects(
+        self, last_commit_hash: str | None = None, until: str | None = None
+    ) -> list:
+        git_service = GitService(repo_path=self.repo_path)
+        return git_service.get_commits_since(
+            last_commit_hash,
+            until,
+            since=self.history_since,
+            max_count=self.max_commits,
+        )
 
     def get_commits(self, since: str | None = None) -> list[str]:
         """Gets commit messages since a given hash via GitService."""
+        return [commit.message for commit in self._get_commit_objects(since)]
+
+    def _format_clusters(
+        self,
+        commits: list,
+        last_commit_hash: str | None = None,
+        until: str | None = None,
+    ) -> str:
         git_service = GitService(repo_path=self.repo_path)
-        commits = git_service.get_commits_since(since)
-        return [commit.message for commit in commits]
+        files = git_service.get_touched_files(
+            last_commit_hash,
+            until,
+            since=self.history_since,
+            max_count=self.max_commits,
+        )
+        clusterer = CommitClusterer(
+            max_clusters=getattr(settings, "REPORTS_AI_CLUSTER_MAX", 12),
+            samples_per_cluster=getattr(
+                settings, "REPORTS_AI_CLUSTER_SAMPLES", 3
+            ),
+        )
+        return clusterer.format_clusters(clusterer.cluster(commits, files))
+
+    def build_context(
+        self,
+        last_commit_hash: str = None,
+        until: str | None = None,
+        sections: int = 1,
+    ) -> str:
+        """Builds the commit data shared by every prompt for a report.
+
+        Each section's prompt carries the whole context, so the flat commit
+        list is only used if `sections` copies of it fit the token budget;
+        otherwise the clustered digest is used.
+        """
+        commits = self._get_commit_objects(last_commit_hash, until)
+        if not self.cluster_commits:
+            payload = "\n".join(
+                f"- ({c.author.name}) {c.message.strip()}" for c in commits
+            )
+            if self.router.within_budget(sections * estimate_tokens(payload)):
+                return f"Commits:\n{payload}"
+
+        digest = self._format_clusters(commits, last_commit_hash, until)
+        return (
+            "The commits have been grouped into themed clusters; each "
+            "cluster lists its size, the paths it touches most and a few "
+            f"representative commits.\n\n{digest}"
+        )
 
     def generate_summary(self, last_commit_hash: str = None) -> str:
-        """Generates a summary of the git commits.
+        """Generates a single-section summary of the git commits.
 
         Args:
             last_commit_hash: The commit hash to get commits since.
 
         Returns:
             The generated summary.
+
+        Raises:
+            TokenBudgetExceeded: If the prompt is over budget even after
+                clustering.
         """
-        prompt = (
-            "Please provide a summary of the git commits. "
-            "If a commit hash is provided, summarize the commits since that hash."
+        context = self.build_context(last_commit_hash)
+        result = self._run_sections(DEFAULT_SECTIONS, context)["summary"]
+        if result["error"]:
+            raise RuntimeError(result["error"])
+        return result["content"]
+
+    def generate_sections(
+        self,
+        last_commit_hash: str = None,
+        until: str | None = None,
+        only: list[str] | None = None,
+    ) -> dict[str, dict]:
+        """Generates the sections of the report type concurrently.
+
+        The commit data is fetched once and shared by every section. A
+        section that raises is recorded with its error instead of failing
+        the others, so it can be regenerated on its own later.
+
+        Args:
+            last_commit_hash: The commit hash to get commits since.
+            until: The last commit to include. Defaults to HEAD.
+            only: Keys of the sections to generate. Defaults to all.
+
+        Returns:
+            Mapping of section key to a dict with `title`, `content` and
+            `error` entries.
+
+        Raises:
+            TokenBudgetExceeded: If the section prompts together are over
+                budget.
+        """
+        template = get_report_sections(self.report_type)
+        sections = template
+        if only is not None:
+            sections = [s for s in template if s.key in only]
+        if not sections:
+            return {}
+
+        # Size the context for the full template, so a retried section sees
+        # the same flat-or-clustered payload as its siblings.
+        context = self.build_context(
+            last_commit_hash, until, sections=len(template)
+        )
+        return self._run_sections(sections, context)
+
+    def _run_sections(
+        self, sections: list[ReportSection], context: str
+    ) -> dict[str, dict]:
+        """Enforces the budget across all prompts, then runs them."""
+        prompts = {s.key: self._section_prompt(s, context) for s in sections}
+        sizes = [estimate_tokens(p) for p in prompts.values()]
+        self.router.check_budget(sum(sizes))
+        model = self.router.route(self.report_type, max(sizes))
+
+        workers = getattr(settings, "REPORTS_AI_SECTION_WORKERS", None)
+        with ThreadPoolExecutor(max_workers=workers or len(sections)) as pool:
+            futures = {
+                key: pool.submit(self._run_prompt, prompt, model)
+                for key, prompt in prompts.items()
+            }
+
+        results = {}
+        for section in sections:
+            try:
+                content, error = futures[section.key].result(), None
+            except Exception as exc:
+                content, error = "", str(exc) or exc.__class__.__name__
+            results[section.key] = {
+                "title": section.title,
+                "content": content,
+                "error": error,
+            }
+        return results
+
+    def _section_prompt(self, section: ReportSection, context: str) -> str:
+        return (
+            f"Write the '{section.title}' section of a "
+            f"{self.report_type or 'progress'} report from the git commits "
+            f"below. {section.instructions} Respond with the section body "
+            "only, without a heading."
+            f"\n\n{context}"
         )
-        if last_commit_hash:
-            prompt += f" The last commit hash is {last_commit_hash}."
 
-        return self.assistant.run(prompt)
+    def _run_prompt(self, prompt: str, model: str) -> str:
+        assistant = ReportAssistant(repo_path=self.repo_path, model=model)
+        return assistant.run(prompt)
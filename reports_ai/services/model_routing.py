@@ -0,0 +1,109 @@
+"""Pre-flight token estimation and per-report model routing.
+
+Routes are configured per `report_type` with the `REPORTS_AI_MODEL_ROUTES`
+setting, a mapping of report type to `(max_tokens, model)` tiers checked in
+order. A tier with `max_tokens=None` matches any size. The `"default"` entry
+applies to report types without their own routes.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+from django.conf import settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+# Rough average for English prose and commit messages.
+CHARS_PER_TOKEN = 4
+
+
+class TokenBudgetExceeded(ValueError):
+    """Raised when a report's prompt exceeds its token budget."""
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Returns the tiktoken encoding, or `None` if it cannot be loaded.
+
+    The encoding file is downloaded on first use, which fails on offline
+    workers; the result (including failure) is cached for the process.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the number of tokens in `text`.
+
+    Uses `tiktoken` when its encoding is available, otherwise a
+    character-count heuristic. Never raises.
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        try:
+            return len(encoding.encode(text))
+        except Exception:
+            pass
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def default_routes() -> dict[str, list[tuple[int | None, str]]]:
+    """Returns the routes used when `REPORTS_AI_MODEL_ROUTES` is unset."""
+    small = os.getenv("REPORTS_AI_LLM_SMALL_MODEL", "gpt-4o-mini")
+    large = os.getenv("REPORTS_AI_LLM_MODEL", "gpt-4o")
+    return {"default": [(8_000, small), (None, large)]}
+
+
+class ModelRouter:
+    """Picks a model for a report from its type and estimated size."""
+
+    def __init__(
+        self,
+        routes: dict[str, list[tuple[int | None, str]]] | None = None,
+        token_budget: int | None = None,
+    ):
+        """Initializes the ModelRouter.
+
+        Args:
+            routes: Tiers per report type. Defaults to the
+                `REPORTS_AI_MODEL_ROUTES` setting.
+            token_budget: Hard per-report prompt token limit. Defaults to
+                the `REPORTS_AI_TOKEN_BUDGET` setting; `None` disables it.
+        """
+        if routes is None:
+            routes = getattr(settings, "REPORTS_AI_MODEL_ROUTES", None)
+        self.routes = routes or default_routes()
+        if token_budget is None:
+            token_budget = getattr(settings, "REPORTS_AI_TOKEN_BUDGET", 120_000)
+        self.token_budget = token_budget
+
+    def within_budget(self, tokens: int) -> bool:
+        """Returns whether `tokens` fits in the per-report budget."""
+        return self.token_budget is None or tokens <= self.token_budget
+
+    def check_budget(self, tokens: int) -> None:
+        """Raises `TokenBudgetExceeded` if `tokens` is over budget."""
+        if not self.within_budget(tokens):
+            raise TokenBudgetExceeded(
+                f"Estimated prompt size of {tokens} tokens exceeds the "
+                f"per-report budget of {self.token_budget} tokens."
+            )
+
+    def route(self, report_type: str | None, tokens: int) -> str:
+        """Returns the model to use for a report of the given size."""
+        tiers = self.routes.get(report_type or "") or self.routes.get(
+            "default", []
+        )
+        for max_tokens, model in tiers:
+            if max_tokens is None or tokens <= max_tokens:
+                return model
+        return os.getenv("REPORTS_AI_LLM_MODEL", "gpt-4o")
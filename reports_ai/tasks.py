@@ -1,11 +1,60 @@
+from datetime import datetime
+
 from celery import shared_task
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
 from .models import ReportInstance
+from .report_types import assemble_report
 from .services.git_service import GitService
 from .services.llm_service import LLMService
 
 
+def _finalize_report(report_instance: ReportInstance) -> None:
+    """Assembles sections and advances the report only if all succeeded."""
+    data = report_instance.generated_sections
+    report_instance.generated_report = assemble_report(
+        report_instance.report_type, data["sections"]
+    )
+    if report_instance.failed_sections:
+        report_instance.report_status = "failed"
+    else:
+        report_instance.last_commit_hash = data["head"]
+        report_instance.report_status = "completed"
+        report_instance.completed_at = timezone.now()
+    report_instance.save()
+
+
+def _record_failure(
+    report_instance_id: int, exc: Exception, section_key: str | None = None
+) -> None:
+    """Marks a report failed and stores why, for display on its page.
+
+    A section retry records the error on that section; any other failure
+    replaces the run data, since its sections no longer describe the report.
+    """
+    error = str(exc) or exc.__class__.__name__
+    with transaction.atomic():
+        report_instance = (
+            ReportInstance.objects.select_for_update()
+            .filter(pk=report_instance_id)
+            .first()
+        )
+        if report_instance is None:
+            return
+        data = report_instance.generated_sections or {}
+        if section_key and section_key in data.get("sections", {}):
+            data["sections"][section_key]["error"] = error
+        else:
+            data = {"error": error}
+        report_instance.generated_sections = data
+        report_instance.report_status = "failed"
+        report_instance.save(
+            update_fields=["generated_sections", "report_status"]
+        )
+
+
 @shared_task
 def generate_report_task(report_instance_id: int):
     """A Celery task to generate a report from a ReportInstance."""
@@ -14,29 +63,95 @@ def generate_report_task(report_instance_id: int):
         report_instance.report_status = "generating"
         report_instance.save()
 
+        base = report_instance.last_commit_hash
+        # Bound the first ingestion; later runs start from base instead.
+        since = None if base else report_instance.history_since()
+        max_commits = None if base else report_instance.max_commits
+
         token = getattr(settings, "REPORTS_AI_GITHUB_TOKEN", None)
         git_service = GitService(
-            repo_url=report_instance.git_repo_url, token=token
+            repo_url=report_instance.git_repo_url,
+            token=token,
+            shallow_since=since,
+            depth=max_commits,
         )
 
-        llm_service = LLMService(repo_path=git_service.clone_path)
-        summary = llm_service.generate_summary(
-            last_commit_hash=report_instance.last_commit_hash
+        llm_service = LLMService(
+            repo_path=git_service.clone_path,
+            report_type=report_instance.report_type,
+            history_since=since,
+            max_commits=max_commits,
+        )
+        head = git_service.get_current_head()
+        sections = llm_service.generate_sections(
+            last_commit_hash=base, until=head
         )
 
-        report_instance.generated_report = summary
-        report_instance.last_commit_hash = git_service.get_current_head()
-        report_instance.report_status = "completed"
-        report_instance.save()
+        report_instance.generated_sections = {
+            "base": base,
+            "head": head,
+            "since": since.isoformat() if since else None,
+            "max_commits": max_commits,
+            "sections": sections,
+        }
+        _finalize_report(report_instance)
 
     except ReportInstance.DoesNotExist:
         # Handle case where ReportInstance is not found
         # You might want to log this error
         pass
-    except Exception:
-        # Handle other exceptions and update status to 'failed'
-        if "report_instance" in locals():
-            report_instance.report_status = "failed"
-            report_instance.save()
-        # You might want to log the exception e
+    except Exception as exc:
+        # Handle other exceptions: mark 'failed' and keep the reason
+        _record_failure(report_instance_id, exc)
+
+
+@shared_task
+def regenerate_section_task(report_instance_id: int, section_key: str):
+    """A Celery task to regenerate one section of a ReportInstance.
+
+    Uses the same commit range as the run that produced the other sections.
+    The result is merged under a row lock, so concurrent retries of other
+    sections are not overwritten.
+    """
+    try:
+        report_instance = ReportInstance.objects.get(pk=report_instance_id)
+        data = report_instance.generated_sections
+        if section_key not in data.get("sections", {}):
+            return
+        report_instance.report_status = "generating"
+        report_instance.save(update_fields=["report_status"])
+
+        token = getattr(settings, "REPORTS_AI_GITHUB_TOKEN", None)
+        git_service = GitService(
+            repo_url=report_instance.git_repo_url, token=token
+        )
+
+        since = data.get("since")
+        llm_service = LLMService(
+            repo_path=git_service.clone_path,
+            report_type=report_instance.report_type,
+            history_since=datetime.fromisoformat(since) if since else None,
+            max_commits=data.get("max_commits"),
+        )
+        result = llm_service.generate_sections(
+            last_commit_hash=data["base"],
+            until=data["head"],
+            only=[section_key],
+        )[section_key]
+
+        with transaction.atomic():
+            report_instance = ReportInstance.objects.select_for_update().get(
+                pk=report_instance_id
+            )
+            latest = report_instance.generated_sections
+            # A full regeneration replaced the run this section belonged to.
+            if latest.get("head") != data["head"]:
+                return
+            latest["sections"][section_key] = result
+            report_instance.generated_sections = latest
+            _finalize_report(report_instance)
+
+    except ReportInstance.DoesNotExist:
         pass
+    except Exception as exc:
+        _record_failure(report_instance_id, exc, section_key)
@@ -5,7 +5,7 @@ from django.views.generic import CreateView, DetailView, ListView
 
 from .forms import ReportInstanceForm
 from .models import ReportInstance
-from .tasks import generate_report_task
+from .tasks import generate_report_task, regenerate_section_task
 
 
 class ReportInstanceCreateView(CreateView):
@@ -33,3 +33,9 @@ class ReportInstanceDetailView(DetailView):
 def trigger_report_generation(request, pk):
     generate_report_task.delay(pk)
     return redirect("admin:reports_ai_reportinstance_change", pk=pk)
+
+
+@staff_member_required
+def retry_report_section(request, pk, section):
+    regenerate_section_task.delay(pk, section)
+    return redirect("admin:reports_ai_reportinstance_change", pk=pk)